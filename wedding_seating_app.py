@@ -1,416 +1,672 @@
-import streamlit as st
-import pandas as pd
-from PIL import Image, ImageDraw
-import os
-import base64
-from io import BytesIO
-
-# --- 1. CONFIGURATION: TABLE COORDINATES & DIMENSIONS ---
-# CRITICAL: These are MOCK PIXEL COORDINATES based on the ORIGINAL size of your map.
-# The application will automatically scale these coordinates if the map is resized below.
-
-TABLE_COORDS = {
-    'VIP': (6230, 1820),
-    '1': (7180, 1820),
-    '2': (5045, 1820),
-    '3': (4100, 2000),
-    '4': (3630, 4100),
-    '5': (2685, 4100),
-    '6': (1730, 4100),
-    '7': (780, 4100)
-}
-# Size of the circle to draw (adjust radius if needed)
-CIRCLE_RADIUS = 35
-
-# NEW: Maximum width for the map image. Image will be scaled down if it exceeds this.
-MAX_MAP_WIDTH_PIXELS = 1800 
-
-# NEW: File path for the static overview image
-OVERVIEW_MAP_FILE = "./data/official_seating_overview.jpg"
-
-# --- 2. DATA LOADING & IMAGE UTILITIES ---
-
-@st.cache_data
-def load_data(file_path, sheet_name):
-    """Loads and cleans the guest data from the Excel file."""
-    if not os.path.exists(file_path):
-        st.error(f"Error: Data file not found at '{file_path}'. Please ensure the file is in the same directory.")
-        return pd.DataFrame() # Return empty DataFrame on error
-
-    try:
-        # Load data from the specified Excel sheet
-        df = pd.read_excel(file_path, sheet_name)
-        # Standardize column names for easier searching (remove potential leading/trailing spaces)
-        df.columns = df.columns.str.strip()
-        return df
-    except Exception as e:
-        st.error(f"Error loading guest data: {e}")
-        # Hint to the user if they might be missing the required library
-        if 'No such file or directory' not in str(e) and 'xlrd' not in str(e) and 'openpyxl' not in str(e):
-             st.warning("You might need to install 'openpyxl' to read Excel files: `pip install openpyxl`")
-        return pd.DataFrame()
-
-@st.cache_resource
-def load_map_image(file_path):
-    """Loads the base map image and resizes it if too large.
-       Returns the image object and the scaling factor applied (1.0 if no resizing occurred)."""
-    if not os.path.exists(file_path):
-        st.error(f"Error: Map image file not found at '{file_path}'.")
-        return None, 1.0
-    try:
-        image = Image.open(file_path).convert("RGB")
-        original_width, original_height = image.size
-        
-        # Determine if resizing is necessary
-        if original_width > MAX_MAP_WIDTH_PIXELS:
-            # Calculate the new height to maintain aspect ratio
-            scaling_factor = MAX_MAP_WIDTH_PIXELS / original_width
-            new_height = int(original_height * scaling_factor)
-            
-            # Resize the image using the high-quality resampling filter
-            resized_image = image.resize((MAX_MAP_WIDTH_PIXELS, new_height), Image.Resampling.LANCZOS)
-            
-            # Return the resized image and the scaling factor
-            return resized_image, scaling_factor
-        
-        # If no resizing needed, scaling factor is 1.0
-        return image, 1.0
-        
-    except Exception as e:
-        st.error(f"Error loading map image: {e}")
-        return None, 1.0
-
-@st.cache_resource
-def load_overview_image(file_path):
-    """Loads the static overview map image and resizes it if too large."""
-    if not os.path.exists(file_path):
-        st.warning(f"Warning: Overview map file not found at '{file_path}'.")
-        return None
-    try:
-        image = Image.open(file_path).convert("RGB")
-        original_width, original_height = image.size
-        
-        # Determine if resizing is necessary using the same MAX_MAP_WIDTH_PIXELS
-        if original_width > MAX_MAP_WIDTH_PIXELS:
-            scaling_factor = MAX_MAP_WIDTH_PIXELS / original_width
-            new_height = int(original_height * scaling_factor)
-            
-            # Resize the image
-            resized_image = image.resize((MAX_MAP_WIDTH_PIXELS, new_height), Image.Resampling.LANCZOS)
-            return resized_image
-        
-        return image
-        
-    except Exception as e:
-        st.error(f"Error loading overview map image: {e}")
-        return None
-
-@st.cache_data
-def get_search_terms(df):
-    """Creates a unique, sorted list of all possible search terms for autocomplete."""
-    # Ensure columns exist before trying to access them
-    names = df['Placard Name'].dropna().astype(str).str.strip().tolist()
-    relationships = df.get('Relationship to Couple', pd.Series()).dropna().astype(str).str.strip().tolist() 
-    
-    # Combine, remove duplicates, and sort alphabetically
-    all_terms = list(set([t for t in names + relationships if t]))
-    return sorted(all_terms, key=str.lower)
-
-def get_image_as_base64(image_obj):
-    """Converts a PIL Image object to a base64 string for embedding in HTML."""
-    if image_obj is None:
-        return None
-    
-    # Save the PIL Image to a bytes buffer
-    buffered = BytesIO()
-    # Use JPEG format for the overview image to keep size down, but PNG for the detailed/marked map
-    format = "JPEG" if image_obj.format == "JPEG" else "PNG"
-    image_obj.save(buffered, format=format)
-    
-    # Encode the bytes to base64
-    return base64.b64encode(buffered.getvalue()).decode()
-
-
-# Load Data and Search Terms
-DATA_FILE = "./data/map_seating_plan.xlsx"
-SHEET_NAME = "NameList"
-MAP_FILE = "./data/floor_plan.png"
-
-# Call load_data and load_map_image
-guest_df = load_data(DATA_FILE, SHEET_NAME)
-
-# Load the main map (which returns the scale factor)
-base_map_and_scale = load_map_image(MAP_FILE)
-base_map = base_map_and_scale[0]
-MAP_SCALE_FACTOR = base_map_and_scale[1] # Store the scale factor
-
-# Load the overview map
-overview_map = load_overview_image(OVERVIEW_MAP_FILE)
-
-all_search_terms = get_search_terms(guest_df)
-
-
-# --- 3. UI SETUP ---
-
-st.set_page_config(
-    page_title="Wedding Seating Finder",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
-
-st.markdown(
-    """
-    <style>
-    .big-font {
-        font-size:30px !important;
-        font-weight: bold;
-    }
-    .stSuccess {
-        background-color: #f0fff4; /* Light green background */
-        border-left: 6px solid #48bb78; /* Green border */
-        padding: 15px;
-        border-radius: 8px;
-        font-size: 1.2em;
-        margin-bottom: 20px;
-        color: #000000; /* Set text color to black for high contrast */
-    }
-    /* Style for the embedded table */
-    .stSuccess table {
-        width: 100%;
-        margin-top: 5px;
-        border-collapse: collapse;
-    }
-    .stSuccess td {
-        padding: 4px 0;
-        vertical-align: top;
-    }
-    .stSuccess td:first-child {
-        font-weight: bold;
-        width: 30%;
-    }
-    /* New CSS to enable scrolling for large content */
-    .scrollable-map {
-        overflow-x: auto; /* Enable horizontal scrolling */
-        overflow-y: auto; /* Enable vertical scrolling */
-        max-height: 1400px; /* NEW: Set max height for the detailed map container */
-        width: 100%; /* Stretch to 100% of the column width */
-        border: 1px solid #ddd; /* Optional: Add border for visual cue */
-        border-radius: 8px;
-        margin-top: 15px;
-    }
-    /* Ensure the image inside the scrollable container adapts its width */
-    .scrollable-map img {
-        min-width: 100%; 
-        width: auto; /* Allow image to use its natural width (up to MAX_MAP_WIDTH_PIXELS) */
-        max-width: none; /* Crucial: Allows scrolling if the image width > container width */
-        height: auto;
-        display: block;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-st.title("🥂 Find Your Seat")
-st.markdown("### Welcome to the Celebration! Please enter your name to find your table.")
-
-# Ensure data is loaded before proceeding
-if guest_df.empty:
-    st.stop()
-
-# --- 4. SEARCH INPUT with Autocomplete/Dropdown ---
-
-# 4.1. Primary search input (Name or Relationship)
-search_selection = st.selectbox(
-    "*Start typing your name or relationship to Bride/Groom:*",
-    options=[''] + all_search_terms, # Add an empty string for the initial prompt
-    index=0,
-    placeholder="e.g., Bride's Aunt, Groom's Family, Uncle, Friend"
-)
-
-final_search_query = search_selection if search_selection else None
-
-
-# --- 5. SEARCH LOGIC AND DISPLAY ---
-
-final_match = pd.DataFrame() # DataFrame to hold the single identified guest
-
-if final_search_query:
-    query_lower = final_search_query.strip().lower()
-
-    # 5.1. Initial Search: Find all rows that match the query (either as a Placard Name or a Group Name)
-    match_is_name = guest_df['Placard Name'].str.strip().str.lower().eq(query_lower)
-    
-    # Check for the Relationship match, ensuring the column exists
-    if 'Relationship to Couple' in guest_df.columns:
-        match_is_relationship = guest_df['Relationship to Couple'].str.strip().str.lower().eq(query_lower)
-        initial_matches = guest_df[match_is_name | match_is_relationship].copy()
-    else:
-        initial_matches = guest_df[match_is_name].copy()
-
-
-    # --- Step 1: Handle Multiple Matches (Group Selection) ---
-    if len(initial_matches) > 1:
-        st.info(f"We found **{len(initial_matches)}** guests matching **'{final_search_query}'**. Please select your specific placard name:")
-        
-        # Create a unique identifier string that matches the selectbox option format
-        initial_matches['UniqueSelection'] = initial_matches.apply(
-            lambda row: f"{row['Placard Name']} ({row['Relationship to Couple']})" if 'Relationship to Couple' in row else row['Placard Name'], axis=1
-        )
-        
-        # Create options for the second selectbox using this unique string
-        selection_options = initial_matches['UniqueSelection'].tolist()
-        
-        # Add an initial prompt option
-        selection_options.insert(0, "")
-
-        # New selection box for the individual guest
-        individual_selection = st.selectbox(
-            "*Select your specific name:*",
-            options=selection_options,
-            index=0
-        )
-        
-        if individual_selection:
-            # Filter using the ENTIRE selected string (UniqueSelection), which guarantees uniqueness
-            final_match = initial_matches[initial_matches['UniqueSelection'] == individual_selection].copy()
-            
-            # Clean up the temporary column after use
-            if 'UniqueSelection' in final_match.columns:
-                final_match = final_match.drop(columns=['UniqueSelection'])
-
-    # --- Step 2: Handle Single Match (Individual Selection) ---
-    elif len(initial_matches) == 1:
-        # A specific Placard Name was selected directly, or only one person matched the relationship.
-        final_match = initial_matches
-        
-    # --- Step 3: Handle No Match ---
-    # final_match remains an empty DataFrame if len(initial_matches) is 0
-
-# --- 5.2. Final Processing and Display ---
-if not final_match.empty:
-    
-    found_table = str(final_match['Table'].iloc[0]).upper()
-    found_name = final_match['Placard Name'].iloc[0]
-    
-    # Use 'Relationship to Couple' for the Group field
-    group_name = final_match['Relationship to Couple'].iloc[0] if 'Relationship to Couple' in final_match.columns else "Relationship N/A"
-
-    # Build the structured success message content using an HTML table
-    success_content = f"""
-    <table>
-        <tr>
-            <td>Your Placard</td>
-            <td>{found_name}</td>
-        </tr>
-        <tr>
-            <td>Table</td>
-            <td><span style="font-size: 1.5em; font-weight: bold; color: #38a169;">{found_table}</span></td>
-        </tr>
-        <tr>
-            <td>Group</td>
-            <td>{group_name}</td>
-        </tr>
-    </table>
-    """
-    # Display success message within the styled div
-    st.markdown(
-        f'<div class="stSuccess">🎉 Here Is Your Info:<br>{success_content}<br>👰🏻🤵🏻Enjoy our Wedding Luncheon!!</div>',
-        unsafe_allow_html=True
-    )
-
-    # NEW: Display the Overview Map (placed here, after info table and before detailed map)
-    if overview_map:
-        st.markdown("### General Seating Overview")
-        st.image(overview_map, width='stretch',output_format='auto')
-
-
-    # 5.3. Display Map with Marker (Scrollable version)
-    if base_map and found_table in TABLE_COORDS:
-        st.markdown("### Floor Plan (Scroll to View More)")
-        st.markdown("*Red Dot Indicates Your Table.*")
-        # 1. Create a copy of the base map to draw on
-        drawn_map = base_map.copy()
-        draw = ImageDraw.Draw(drawn_map)
-
-        # 2. Get coordinates and apply scaling factor
-        original_x, original_y = TABLE_COORDS[found_table]
-        
-        # Scale coordinates based on image resizing
-        x = int(original_x * MAP_SCALE_FACTOR)
-        y = int(original_y * MAP_SCALE_FACTOR)
-        
-        # The circle radius should also scale to remain proportional
-        scaled_radius = int(CIRCLE_RADIUS * MAP_SCALE_FACTOR)
-
-        # Draw a thick red circle marker
-        draw.ellipse(
-            (x - scaled_radius, y - scaled_radius, x + scaled_radius, y + scaled_radius),
-            outline='#FF0000', # Red color
-            width=10
-        )
-
-        # 3. Convert the marked image to base64
-        base64_image_data = get_image_as_base64(drawn_map)
-        
-        # 4. Use markdown to embed the image in a scrollable div
-        if base64_image_data:
-            st.markdown(f"""
-            <div class="scrollable-map">
-                <img src="data:image/png;base64,{base64_image_data}" alt="Seating Map with Table Marked">
-            </div>
-            """, unsafe_allow_html=True)
-
-    elif base_map:
-        st.warning(f"Your table, '{found_table}', was found, but its location is missing from the map configuration (`TABLE_COORDS`).")
-        # Display the original map using the scrollable markdown method
-        base64_image_data = get_image_as_base64(base_map)
-        if base64_image_data:
-             st.markdown(f"""
-            <div class="scrollable-map">
-                <img src="data:image/png;base64,{base64_image_data}" alt="Full Seating Map">
-            </div>
-            """, unsafe_allow_html=True)
-
-
-    # --- 5.4. Handle Final Error ---
-    # (Error handled implicitly when final_match is empty)
-# 5.4. Handle Final Error
-elif final_search_query and final_match.empty and len(initial_matches) == 0:
-    st.error("Guest name or relationship not found. Please try entering a different name or ask an usher for assistance.")
-    
-    # NEW: Display Overview Map here for failed searches
-    if overview_map:
-        st.markdown("### General Seating Overview")
-        st.image(overview_map, width='stretch',output_format='auto')
-
-    # Display the static map if search fails (Scrollable version)
-    if base_map:
-        st.markdown("### Floor Plan (Scroll to View More)")
-        st.markdown("*Red Dot Indicates Your Table.*")
-        base64_image_data = get_image_as_base64(base_map)
-        if base64_image_data:
-             st.markdown(f"""
-            <div class="scrollable-map">
-                <img src="data:image/png;base64,{base64_image_data}" alt="Full Seating Map">
-            </div>
-            """, unsafe_allow_html=True)
-
-else:
-    # Display the static map if no search is active (Initial load)
-    
-    # NEW: Display Overview Map first for initial load
-    if overview_map:
-        st.markdown("### General Seating Overview")
-        st.image(overview_map, width='stretch',output_format='auto')
-        
-    if base_map:
-        st.markdown("### Floor Plan (Scroll to View More)")
-        st.markdown("*Red Dot Indicates Your Table.*")
-        base64_image_data = get_image_as_base64(base_map)
-        if base64_image_data:
-             st.markdown(f"""
-            <div class="scrollable-map">
-                <img src="data:image/png;base64,{base64_image_data}" alt="Full Seating Map">
-            </div>
-            """, unsafe_allow_html=True)
+import streamlit as st
+import pandas as pd
+import numpy as np
+from PIL import Image
+import os
+import base64
+from io import BytesIO
+
+# --- 1. CONFIGURATION: TABLE COORDINATES & DIMENSIONS ---
+# CRITICAL: These are MOCK PIXEL COORDINATES based on the ORIGINAL size of your map.
+# The application will automatically scale these coordinates if the map is resized below.
+
+TABLE_COORDS = {
+    'VIP': (6230, 1820),
+    '1': (7180, 1820),
+    '2': (5045, 1820),
+    '3': (4100, 2000),
+    '4': (3630, 4100),
+    '5': (2685, 4100),
+    '6': (1730, 4100),
+    '7': (780, 4100)
+}
+# Normalize the config keys once so lookups are case-insensitive without any
+# per-match case fixing; the Table column is upper-cased to match at load.
+TABLE_COORDS = {name.upper(): xy for name, xy in TABLE_COORDS.items()}
+
+# SoA view of TABLE_COORDS: sorted table names alongside an int32 coordinate
+# array, so bulk operations (scaling, marker generation) run as single
+# vectorized ops and membership checks are a binary search.
+TABLE_NAMES = np.array(sorted(TABLE_COORDS))
+TABLE_XY = np.array([TABLE_COORDS[name] for name in TABLE_NAMES], dtype=np.int32)
+
+def table_has_coords(table):
+    """Checks whether a table has map coordinates via binary search over the
+       sorted name array."""
+    pos = np.searchsorted(TABLE_NAMES, table)
+    return pos < len(TABLE_NAMES) and TABLE_NAMES[pos] == table
+
+# Size of the circle to draw (adjust radius if needed)
+CIRCLE_RADIUS = 35
+
+# NEW: Maximum width for the map image. Image will be scaled down if it exceeds this.
+MAX_MAP_WIDTH_PIXELS = 1800 
+
+# NEW: File path for the static overview image
+OVERVIEW_MAP_FILE = "./data/official_seating_overview.jpg"
+
+# --- 2. DATA LOADING & IMAGE UTILITIES ---
+
+# Use the pyarrow-backed string dtype when available: its .str kernels are
+# considerably faster than the default object/string implementation.
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    STRING_DTYPE = "string"
+
+# rapidfuzz (optional) powers the typo-tolerant fallback for typed names;
+# without it, free-text searches are exact-match only.
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:
+    fuzz = fuzz_process = None
+
+
+def _read_with_parquet_cache(xlsx_path, sheet_name):
+    """Reads the guest sheet, maintaining a Parquet copy next to it that is
+       regenerated whenever the spreadsheet's mtime is newer. Parquet reads
+       are 20-50x faster than openpyxl's pure-Python xlsx parsing, which
+       matters on every cold start before the cache is warm. The copy is
+       purely an optimization: if it cannot be read or written, the Excel
+       parse done here is used directly — never parsed a second time."""
+    parquet_path = os.path.splitext(xlsx_path)[0] + ".parquet"
+    try:
+        if os.path.exists(parquet_path) and (
+            not os.path.exists(xlsx_path)
+            or os.path.getmtime(parquet_path) >= os.path.getmtime(xlsx_path)
+        ):
+            return pd.read_parquet(parquet_path)
+    except Exception:
+        pass
+    df = pd.read_excel(xlsx_path, sheet_name)
+    try:
+        # Arrow refuses mixed-type object columns (the Table column holds both
+        # numbers and 'VIP'), so cast them to a string dtype before writing.
+        object_cols = df.columns[df.dtypes == object]
+        df.astype({c: STRING_DTYPE for c in object_cols}).to_parquet(parquet_path)
+    except Exception:
+        pass  # No cache for next start, but this load already has the frame.
+    return df
+
+@st.cache_data
+def load_data(file_path, sheet_name):
+    """Loads and cleans the guest data, reading through the automatically
+       maintained Parquet copy of the Excel sheet (see
+       _read_with_parquet_cache)."""
+    parquet_path = os.path.splitext(file_path)[0] + ".parquet"
+    if not (os.path.exists(file_path) or os.path.exists(parquet_path)):
+        st.error(f"Error: Data file not found at '{file_path}'. Please ensure the file is in the same directory.")
+        return pd.DataFrame() # Return empty DataFrame on error
+
+    try:
+        # Reads the Parquet copy when fresh, else parses the Excel sheet once
+        # (and refreshes the copy as a side effect).
+        df = _read_with_parquet_cache(file_path, sheet_name)
+        # Standardize column names for easier searching (remove potential leading/trailing spaces)
+        df.columns = df.columns.str.strip()
+        # Keep only the columns the app actually reads. Carrying the whole
+        # sheet through the cache bloats memory and every later string pass;
+        # the string dtype also dispatches .str ops to the fast kernels.
+        needed = ['Placard Name', 'Relationship to Couple', 'Table']
+        present = [c for c in needed if c in df.columns]
+        df = df[present].astype({c: STRING_DTYPE for c in present})
+        # Precompute normalized search columns once, so each search is a single
+        # vectorized comparison instead of re-stripping/lowering per rerun.
+        if 'Placard Name' in df.columns:
+            df['_placard_norm'] = df['Placard Name'].astype(STRING_DTYPE).str.strip().str.casefold()
+        if 'Relationship to Couple' in df.columns:
+            df['_rel_norm'] = df['Relationship to Couple'].astype(STRING_DTYPE).str.strip().str.casefold()
+        # Upper-case the table labels once so they match the (upper-cased)
+        # TABLE_COORDS keys without per-match case fixing. Blank cells become
+        # '' rather than <NA>, which would blow up the coordinate lookup.
+        if 'Table' in df.columns:
+            df['Table'] = df['Table'].fillna('').str.strip().str.upper()
+        return df
+    except Exception as e:
+        st.error(f"Error loading guest data: {e}")
+        # Hint to the user if they might be missing the required library
+        if 'No such file or directory' not in str(e) and 'xlrd' not in str(e) and 'openpyxl' not in str(e):
+             st.warning("You might need to install 'openpyxl' to read Excel files: `pip install openpyxl`")
+        return pd.DataFrame()
+
+def save_static_image(image, filename):
+    """Writes an image into ./static once, so it can be referenced by URL and
+       cached by the browser instead of being re-encoded and re-sent on every
+       rerun. Requires static serving to be enabled (see
+       .streamlit/config.toml). Returns the URL path, or None if the file
+       could not be written."""
+    try:
+        os.makedirs("static", exist_ok=True)
+        path = os.path.join("static", filename)
+        if filename.endswith(".png"):
+            # Flat-colour plan art: a small quantized palette compresses 3-5x
+            # better than truecolour PNG and keeps line edges crisp where
+            # JPEG would ring. FASTOCTREE keeps the one-off quantize cheap.
+            image.quantize(colors=128, method=Image.FASTOCTREE).save(path, "PNG", optimize=True)
+        else:
+            image.save(path, "JPEG", quality=85)
+        return f"app/static/{filename}"
+    except Exception as e:
+        st.warning(f"Could not write static image file: {e}")
+        return None
+
+@st.cache_resource
+def load_map_image(file_path):
+    """Loads the base map image and resizes it if too large.
+       Returns the image object, the scaling factor applied (1.0 if no
+       resizing occurred) and the static URL of the unmarked map."""
+    if not os.path.exists(file_path):
+        st.error(f"Error: Map image file not found at '{file_path}'.")
+        return None, 1.0, None
+    try:
+        image = Image.open(file_path)
+        # Only convert when needed: for an already-RGB source, convert("RGB")
+        # would allocate and fill a whole new pixel buffer for nothing.
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        original_width, original_height = image.size
+
+        # Determine if resizing is necessary
+        if original_width > MAX_MAP_WIDTH_PIXELS:
+            # Calculate the new height to maintain aspect ratio
+            scaling_factor = MAX_MAP_WIDTH_PIXELS / original_width
+            new_height = int(original_height * scaling_factor)
+
+            # Resize the image using the high-quality resampling filter
+            resized_image = image.resize((MAX_MAP_WIDTH_PIXELS, new_height), Image.LANCZOS)
+
+            # Return the resized image, the scaling factor and the static URL
+            return resized_image, scaling_factor, save_static_image(resized_image, "floor_plan_resized.png")
+
+        # If no resizing needed, scaling factor is 1.0
+        return image, 1.0, save_static_image(image, "floor_plan_resized.png")
+
+    except Exception as e:
+        st.error(f"Error loading map image: {e}")
+        return None, 1.0, None
+
+@st.cache_resource
+def load_overview_image(file_path):
+    """Loads the static overview map image and resizes it if too large.
+       Returns the image object and its static URL (None if unavailable)."""
+    if not os.path.exists(file_path):
+        st.warning(f"Warning: Overview map file not found at '{file_path}'.")
+        return None, None
+    try:
+        image = Image.open(file_path)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        original_width, original_height = image.size
+
+        # Determine if resizing is necessary using the same MAX_MAP_WIDTH_PIXELS
+        if original_width > MAX_MAP_WIDTH_PIXELS:
+            scaling_factor = MAX_MAP_WIDTH_PIXELS / original_width
+            new_height = int(original_height * scaling_factor)
+
+            # Resize the image
+            image = image.resize((MAX_MAP_WIDTH_PIXELS, new_height), Image.LANCZOS)
+
+        return image, save_static_image(image, "seating_overview.jpg")
+
+    except Exception as e:
+        st.error(f"Error loading overview map image: {e}")
+        return None, None
+
+# Empty fallback for index lookups that find nothing
+EMPTY_POSITIONS = np.array([], dtype=np.int64)
+
+@st.cache_data
+def build_search_index(df):
+    """Builds the autocomplete term list and the search index in one cached
+       pass over the guest list: a sorted list of display terms (original
+       casing) for the selectbox, and a dict mapping each normalized term to
+       its row positions so the exact-match search is an O(1) lookup instead
+       of a full-DataFrame scan on every rerun."""
+    index = {}
+    raw_columns = []
+    # Reuse the normalized columns precomputed in load_data rather than
+    # re-stripping/casefolding the raw values a second time.
+    for raw_col, norm_col in (('Placard Name', '_placard_norm'),
+                              ('Relationship to Couple', '_rel_norm')):
+        if norm_col not in df.columns:
+            continue
+        norm_terms = df[norm_col].dropna()
+        raw_columns.append(df[raw_col][norm_terms.index].str.strip().to_numpy(dtype=object))
+        for pos, term in zip(df.index.get_indexer(norm_terms.index), norm_terms):
+            if term:
+                index.setdefault(term, []).append(pos)
+
+    # Build the display list entirely in C: pd.unique dedups in one hashing
+    # pass, then a single vectorized lowercasing feeds a stable argsort, so
+    # the sort key is computed once per term rather than once per comparison.
+    if raw_columns:
+        terms = pd.unique(np.concatenate(raw_columns))
+        terms = terms[terms != '']
+        order = np.argsort(np.char.lower(terms.astype(str)), kind='stable')
+        terms = terms[order].tolist()
+    else:
+        terms = []
+
+    # np.unique drops the duplicate position recorded when a row's normalized
+    # name equals its normalized relationship, so such a row matches once
+    # (as it did under the baseline's boolean OR) instead of appearing twice.
+    return terms, {term: np.unique(np.asarray(positions, dtype=np.int64)) for term, positions in index.items()}
+
+@st.cache_data
+def find_matches(query_lower):
+    """Returns the guest rows matching a normalized query. Cached per query so
+       reruns with unchanged input (every widget event triggers one) skip both
+       the index lookup and the row materialization; st.cache_data hands back
+       a fresh copy, so downstream mutation of the result is safe."""
+    positions = term_index.get(query_lower)
+    if positions is None:
+        # Terms chosen from the selectbox are always in the index; this raw
+        # NumPy equality scan covers queries arriving from any other path
+        # with zero pandas intermediates.
+        positions = np.flatnonzero(PLACARD_NORM_ARR == query_lower)
+        if len(positions) == 0 and fuzz_process is not None and len(query_lower) >= 3:
+            # Typo-tolerant fallback for typed queries. rapidfuzz's C core
+            # scores the whole array in a single call and short-circuits on
+            # the cutoff, so this stays cheap as the guest list grows.
+            hit = fuzz_process.extractOne(
+                query_lower, PLACARD_NORM_ARR,
+                scorer=fuzz.WRatio, processor=None, score_cutoff=80
+            )
+            if hit is not None:
+                positions = term_index.get(hit[0], EMPTY_POSITIONS)
+    return guest_df.iloc[positions]
+
+@st.cache_resource
+def map_assets():
+    """Loads the floor plan on first use and derives everything that depends
+       on its scale factor: the static URL and the pre-scaled marker geometry
+       (one vectorized multiply, so the marker path consumes ready-made
+       integers). Deferred to the render path so the title and search box
+       paint before the PNG decode; cache_resource makes later calls free."""
+    image, scale, url = load_map_image(MAP_FILE)
+    scaled_xy = (TABLE_XY * scale).astype(np.int32)
+    scaled_radius = int(CIRCLE_RADIUS * scale)
+    return image, url, scaled_xy, scaled_radius
+
+def build_marker_html(highlight_table=None):
+    """Emits one absolutely-positioned <div> ring per table to overlay on the
+       base map, with the selected table's marker switched on via a CSS class.
+       The browser composites the circle, so highlighting a table costs a few
+       hundred bytes of HTML instead of a server-side copy + draw + re-encode
+       of the whole map.
+
+       Positions and size are expressed as percentages of the map dimensions,
+       so the rings stay aligned however the container scales the image."""
+    base_map, _, scaled_xy, scaled_radius = map_assets()
+    width, height = base_map.size
+    coords_pct = scaled_xy * (100.0 / np.array([width, height]))
+    size_pct = 200.0 * scaled_radius / width
+    return ''.join(
+        f'<div class="marker{" on" if table == highlight_table else ""}" '
+        f'style="left:{x:.3f}%;top:{y:.3f}%;width:{size_pct:.3f}%"></div>'
+        for table, (x, y) in zip(TABLE_NAMES, coords_pct)
+    )
+
+@st.cache_resource
+def marker_overlay_variants():
+    """Precomputes the complete overlay HTML for every possible highlight
+       (one variant per table, plus the all-off variant keyed by None), so a
+       rerun fetches its markup with a dict lookup instead of re-formatting
+       every coordinate."""
+    variants = {table: build_marker_html(table) for table in TABLE_NAMES}
+    variants[None] = build_marker_html(None)
+    return variants
+
+def render_overview_map():
+    """Renders the overview image, preferring the browser-cacheable static URL
+       so the image bytes are served once instead of being pushed through
+       Streamlit's media pipeline on every rerun."""
+    # Loaded lazily so users who go straight to a search never pay for it;
+    # cache_resource makes every call after the first free.
+    overview_map, overview_url = load_overview_image(OVERVIEW_MAP_FILE)
+    if overview_map is None:
+        return
+    st.markdown("### General Seating Overview")
+    if overview_url:
+        st.markdown(
+            f'<img src="{overview_url}" alt="General Seating Overview" style="width:100%">',
+            unsafe_allow_html=True
+        )
+    else:
+        st.image(overview_map, width='stretch', output_format='auto')
+
+def render_scrollable_map(highlight_table=None, alt="Full Seating Map"):
+    """Renders the scrollable floor plan, optionally highlighting one table.
+       Shared by the success, no-match and idle branches so there is a single
+       render path (and a single encoder fallback) to keep in sync."""
+    base_map, map_data_url, _, _ = map_assets()
+    if not map_data_url:
+        # Static serving unavailable: fall back to an inline data URL, but
+        # encode it once per session instead of on every rerun.
+        if 'base_map_data_url' not in st.session_state:
+            st.session_state.base_map_data_url = get_image_as_data_url(base_map)
+        map_data_url = st.session_state.base_map_data_url
+    if not map_data_url:
+        return
+    st.markdown("### Floor Plan (Scroll to View More)")
+    st.markdown("*Red Dot Indicates Your Table.*")
+    st.markdown(f"""
+    <div class="scrollable-map">
+        <div class="map-wrap">
+            <img src="{map_data_url}" alt="{alt}">
+            {marker_overlay_variants()[highlight_table]}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def get_image_as_data_url(image_obj):
+    """Converts a PIL Image object to a base64 data URL for embedding in HTML.
+       WebP encodes faster than PNG's DEFLATE at a fraction of the payload
+       and, unlike JPEG, also covers images with an alpha channel, so one
+       format serves every caller."""
+    if image_obj is None:
+        return None
+
+    # Save the PIL Image to a bytes buffer
+    buffered = BytesIO()
+    image_obj.save(buffered, format="WEBP", quality=85)
+
+    # Encode the bytes to base64 and wrap as a data URL
+    return f"data:image/webp;base64,{base64.b64encode(buffered.getvalue()).decode()}"
+
+
+# Load Data and Search Terms
+DATA_FILE = "./data/map_seating_plan.xlsx"
+SHEET_NAME = "NameList"
+MAP_FILE = "./data/floor_plan.png"
+
+# Call load_data; the floor plan itself is loaded lazily by map_assets()
+# from the render path, so first paint never waits on the PNG decode.
+guest_df = load_data(DATA_FILE, SHEET_NAME)
+
+all_search_terms, term_index = build_search_index(guest_df)
+
+# Raw NumPy view of the normalized placard names, for lookup paths that
+# bypass pandas entirely (direct equality scans and the fuzzy fallback).
+if '_placard_norm' in guest_df.columns:
+    PLACARD_NORM_ARR = guest_df['_placard_norm'].fillna('').to_numpy()
+else:
+    PLACARD_NORM_ARR = np.array([], dtype=object)
+
+# Precompute column positions once so the per-rerun result extraction can use
+# .iat scalar access instead of building an intermediate Series per column.
+COL_TABLE = guest_df.columns.get_loc('Table') if 'Table' in guest_df.columns else None
+COL_NAME = guest_df.columns.get_loc('Placard Name') if 'Placard Name' in guest_df.columns else None
+COL_REL = guest_df.columns.get_loc('Relationship to Couple') if 'Relationship to Couple' in guest_df.columns else None
+HAS_REL = COL_REL is not None # Saves a per-rerun column-membership lookup
+
+
+# --- 3. UI SETUP ---
+
+st.set_page_config(
+    page_title="Wedding Seating Finder",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+# The stylesheet never changes, so it is written to ./static once and pulled
+# in with a one-line <link> per rerun instead of pushing the whole block
+# through the markdown sanitizer every time. The inline <style> fallback is
+# only used when static serving is unavailable.
+APP_CSS = """\
+    .big-font {
+        font-size:30px !important;
+        font-weight: bold;
+    }
+    .stSuccess {
+        background-color: #f0fff4; /* Light green background */
+        border-left: 6px solid #48bb78; /* Green border */
+        padding: 15px;
+        border-radius: 8px;
+        font-size: 1.2em;
+        margin-bottom: 20px;
+        color: #000000; /* Set text color to black for high contrast */
+    }
+    /* Style for the embedded table */
+    .stSuccess table {
+        width: 100%;
+        margin-top: 5px;
+        border-collapse: collapse;
+    }
+    .stSuccess td {
+        padding: 4px 0;
+        vertical-align: top;
+    }
+    .stSuccess td:first-child {
+        font-weight: bold;
+        width: 30%;
+    }
+    /* New CSS to enable scrolling for large content */
+    .scrollable-map {
+        overflow-x: auto; /* Enable horizontal scrolling */
+        overflow-y: auto; /* Enable vertical scrolling */
+        max-height: 1400px; /* NEW: Set max height for the detailed map container */
+        width: 100%; /* Stretch to 100% of the column width */
+        border: 1px solid #ddd; /* Optional: Add border for visual cue */
+        border-radius: 8px;
+        margin-top: 15px;
+    }
+    /* Positioning context for the HTML table markers over the map */
+    .map-wrap {
+        position: relative;
+        display: inline-block;
+        min-width: 100%;
+    }
+    .marker {
+        position: absolute;
+        aspect-ratio: 1 / 1; /* width is set in %, keep the ring circular */
+        border-radius: 50%;
+        transform: translate(-50%, -50%);
+        pointer-events: none;
+        display: none;
+    }
+    .marker.on {
+        display: block;
+        border: 10px solid #FF0000;
+    }
+    /* Ensure the image inside the scrollable container adapts its width */
+    .scrollable-map img {
+        min-width: 100%; 
+        width: auto; /* Allow image to use its natural width (up to MAX_MAP_WIDTH_PIXELS) */
+        max-width: none; /* Crucial: Allows scrolling if the image width > container width */
+        height: auto;
+        display: block;
+    }
+    
+"""
+
+@st.cache_resource
+def get_css_url():
+    """Writes the stylesheet into ./static once; returns its URL or None."""
+    try:
+        os.makedirs("static", exist_ok=True)
+        with open(os.path.join("static", "style.css"), "w") as f:
+            f.write(APP_CSS)
+        return "app/static/style.css"
+    except Exception:
+        return None
+
+css_url = get_css_url()
+if css_url:
+    st.markdown(f'<link rel="stylesheet" href="{css_url}">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{APP_CSS}</style>", unsafe_allow_html=True)
+
+st.title("🥂 Find Your Seat")
+st.markdown("### Welcome to the Celebration! Please enter your name to find your table.")
+
+# Ensure data is loaded before proceeding
+if guest_df.empty:
+    st.stop()
+
+# --- 4. SEARCH INPUT with Autocomplete/Dropdown ---
+
+# 4.1. Primary search input (Name or Relationship)
+search_selection = st.selectbox(
+    "*Start typing your name or relationship to Bride/Groom:*",
+    options=[''] + all_search_terms, # Add an empty string for the initial prompt
+    index=0,
+    placeholder="e.g., Bride's Aunt, Groom's Family, Uncle, Friend"
+)
+
+# 4.2. Free-text fallback for guests who cannot find themselves in the list
+# (e.g. because of a typo on the placard or a different spelling). Normalized
+# at this boundary; the selectbox path stays canonical and untouched.
+typed_query = st.text_input(
+    "*Can't find yourself in the list? Type your name here:*",
+    placeholder="e.g., Jonathan Tan"
+)
+
+final_search_query = search_selection if search_selection else (typed_query.strip() or None)
+
+
+# --- 5. SEARCH LOGIC AND DISPLAY ---
+
+# Streamlit reruns the whole script on every widget event, so remember the
+# last uniquely-resolved query in the session and skip the search pipeline
+# entirely when the query has not changed since the previous rerun.
+if 'last_query' not in st.session_state:
+    st.session_state.last_query = None
+    st.session_state.last_match = None
+
+final_match = pd.DataFrame() # DataFrame to hold the single identified guest
+
+if final_search_query:
+    # Selectbox queries are already canonical pre-stripped terms, and typed
+    # queries are stripped at the input; casefold is all that remains.
+    query_lower = final_search_query.casefold()
+
+    if query_lower == st.session_state.last_query and st.session_state.last_match is not None:
+        # Unchanged query that already resolved to a single guest: reuse the
+        # stored row without touching the DataFrame at all.
+        final_match = st.session_state.last_match
+        initial_matches = final_match
+    else:
+        # 5.1. Initial Search: Find all rows that match the query (either as a Placard Name or a Group Name)
+        # An O(1) indexed lookup, cached per query across reruns.
+        initial_matches = find_matches(query_lower)
+
+
+    # --- Step 1: Handle Multiple Matches (Group Selection) ---
+    if len(initial_matches) > 1:
+        st.info(f"We found **{len(initial_matches)}** guests matching **'{final_search_query}'**. Please select your specific placard name:")
+        
+        # Build the unique option labels as a standalone list instead of a
+        # temporary DataFrame column, so there is nothing to drop (and copy)
+        # afterwards. Vectorized string concatenation rather than a per-row
+        # apply(axis=1) lambda, which dispatches a Python frame for every row.
+        # The columns are already string dtype (cast once in load_data), so no
+        # per-use astype conversion is needed here.
+        if HAS_REL:
+            option_labels = (initial_matches['Placard Name'].str.cat(
+                initial_matches['Relationship to Couple'], sep=' (', na_rep='') + ')').tolist()
+        else:
+            option_labels = initial_matches['Placard Name'].tolist()
+
+        # Add an initial prompt option
+        selection_options = [""] + option_labels
+
+        # New selection box for the individual guest
+        individual_selection = st.selectbox(
+            "*Select your specific name:*",
+            options=selection_options,
+            index=0
+        )
+
+        if individual_selection:
+            # Map the chosen label back to its row by position; the labels are
+            # unique, so the first index is the right one.
+            row_idx = option_labels.index(individual_selection)
+            final_match = initial_matches.iloc[[row_idx]]
+
+    # --- Step 2: Handle Single Match (Individual Selection) ---
+    elif len(initial_matches) == 1:
+        # A specific Placard Name was selected directly, or only one person matched the relationship.
+        final_match = initial_matches
+        # Remember the resolved row so unchanged-query reruns skip the lookup.
+        # Multi-match queries are deliberately not cached: their second
+        # selectbox has to render (and stay changeable) on every rerun.
+        st.session_state.last_query = query_lower
+        st.session_state.last_match = final_match
+
+    # --- Step 3: Handle No Match ---
+    # final_match remains an empty DataFrame if len(initial_matches) is 0
+
+# --- 5.2. Final Processing and Display ---
+if not final_match.empty:
+    
+    # Single positional row fetch, then .iat scalar reads against the column
+    # positions precomputed at load time.
+    row = final_match.iloc[0]
+    found_table = row.iat[COL_TABLE] # Already stripped/upper-cased at load
+    found_name = row.iat[COL_NAME]
+
+    # Use 'Relationship to Couple' for the Group field
+    group_name = row.iat[COL_REL] if HAS_REL else "Relationship N/A"
+
+    # Build the structured success message content using an HTML table
+    success_content = f"""
+    <table>
+        <tr>
+            <td>Your Placard</td>
+            <td>{found_name}</td>
+        </tr>
+        <tr>
+            <td>Table</td>
+            <td><span style="font-size: 1.5em; font-weight: bold; color: #38a169;">{found_table or "N/A"}</span></td>
+        </tr>
+        <tr>
+            <td>Group</td>
+            <td>{group_name}</td>
+        </tr>
+    </table>
+    """
+    # Display success message within the styled div
+    st.markdown(
+        f'<div class="stSuccess">🎉 Here Is Your Info:<br>{success_content}<br>👰🏻🤵🏻Enjoy our Wedding Luncheon!!</div>',
+        unsafe_allow_html=True
+    )
+
+    # NEW: Display the Overview Map (placed here, after info table and before detailed map)
+    render_overview_map()
+
+
+    # 5.3. Display Map with Marker (Scrollable version)
+    base_map = map_assets()[0]
+    if base_map and table_has_coords(found_table):
+        # The base map ships unchanged and the selected table is highlighted
+        # with a CSS ring, so no server-side image work happens per search.
+        render_scrollable_map(highlight_table=found_table, alt="Seating Map with Table Marked")
+
+    elif base_map:
+        st.warning(f"Your table, '{found_table}', was found, but its location is missing from the map configuration (`TABLE_COORDS`).")
+        # Display the original map using the scrollable markdown method
+        render_scrollable_map()
+
+
+    # --- 5.4. Handle Final Error ---
+    # (Error handled implicitly when final_match is empty)
+# 5.4. Handle Final Error
+elif final_search_query and final_match.empty and len(initial_matches) == 0:
+    st.error("Guest name or relationship not found. Please try entering a different name or ask an usher for assistance.")
+    
+    # NEW: Display Overview Map here for failed searches
+    render_overview_map()
+
+    # Display the static map if search fails (Scrollable version);
+    # render_scrollable_map is a no-op when the map failed to load.
+    render_scrollable_map()
+
+else:
+    # Display the static map if no search is active (Initial load)
+    
+    # NEW: Display Overview Map first for initial load
+    render_overview_map()
+
+    render_scrollable_map()